@@ -135,3 +135,111 @@ class TestPerformance:
         
         assert response.status_code == 200
         assert (end_time - start_time) < 1.0  # Должен отвечать быстрее 1 секунды
+
+
+class TestHeartbeatHistory:
+    def _post_heartbeats(self, client, agent_id, count):
+        for _ in range(count):
+            response = client.post("/api/agents/heartbeat", json={"agent_id": agent_id})
+            assert response.status_code == 200
+
+    def test_since_id_returns_every_new_heartbeat(self, client):
+        """Тест курсора: при > limit новых heartbeat'ов ни один не теряется"""
+        import uuid
+        agent_id = f"USR{uuid.uuid4().hex[:7]}"
+        self._post_heartbeats(client, agent_id, 3)
+
+        first = client.get(f"/api/agents/{agent_id}/heartbeats", params={"limit": 2}).json()
+        cursor = first["next_since_id"]
+        seen = [hb["id"] for hb in first["heartbeats"]]
+        assert seen[0] == cursor
+
+        # Между опросами приходит больше heartbeat'ов, чем limit
+        self._post_heartbeats(client, agent_id, 5)
+
+        new_ids = []
+        while True:
+            page = client.get(
+                f"/api/agents/{agent_id}/heartbeats",
+                params={"since_id": cursor, "limit": 2}
+            ).json()
+            if not page["heartbeats"]:
+                break
+            ids = [hb["id"] for hb in page["heartbeats"]]
+            assert ids == sorted(ids)
+            assert page["next_since_id"] == ids[-1]
+            new_ids.extend(ids)
+            cursor = page["next_since_id"]
+
+        assert len(new_ids) == 5
+        assert len(set(new_ids)) == 5
+        assert min(new_ids) > max(seen)
+
+
+class TestHeartbeatIngest:
+    def test_heartbeat_with_large_integer_is_stored(self, client):
+        """Тест: целые больше 64 бит сохраняются и возвращаются без потерь"""
+        import uuid
+        agent_id = f"USR{uuid.uuid4().hex[:7]}"
+        body = '{"agent_id": "%s", "big": 1180591620717411303424}' % agent_id
+
+        response = client.post(
+            "/api/agents/heartbeat",
+            content=body,
+            headers={"content-type": "application/json"}
+        )
+        assert response.status_code == 200
+
+        history = client.get(f"/api/agents/{agent_id}/heartbeats").json()
+        assert history["heartbeats"][0]["data"]["big"] == 1180591620717411303424
+
+    def test_msgpack_heartbeat_is_stored(self, client):
+        """Тест: heartbeat в MessagePack принимается и сохраняется как JSON"""
+        import uuid
+        import msgspec
+        agent_id = f"USR{uuid.uuid4().hex[:7]}"
+        body = msgspec.msgpack.encode({
+            "agent_id": agent_id,
+            "status": "active",
+            "statistics": {"keystrokes": 42}
+        })
+
+        response = client.post(
+            "/api/agents/heartbeat/msgpack",
+            content=body,
+            headers={"content-type": "application/msgpack"}
+        )
+        assert response.status_code == 200
+        assert response.json()["agent_id"] == agent_id
+
+        history = client.get(f"/api/agents/{agent_id}/heartbeats").json()
+        assert history["heartbeats"][0]["data"]["statistics"] == {"keystrokes": 42}
+
+    def test_rate_limit_returns_429_when_bucket_is_empty(self, client):
+        """Тест: после исчерпания корзины агента heartbeat получает 429"""
+        import uuid
+        from app.api.endpoints import heartbeat
+        agent_id = f"USR{uuid.uuid4().hex[:7]}"
+
+        # Время стоит на месте - корзина не пополняется между запросами
+        with patch("app.api.endpoints.heartbeat.time.monotonic", return_value=1000.0):
+            for _ in range(int(heartbeat.HEARTBEAT_BURST)):
+                assert heartbeat.consume_heartbeat_token(agent_id)
+
+            response = client.post("/api/agents/heartbeat", json={"agent_id": agent_id})
+            assert response.status_code == 429
+
+
+class TestTemplateValidation:
+    def test_malformed_template_data_is_rejected(self, client):
+        """Тест: template_data не по схеме отклоняется с 422"""
+        response = client.post("/api/behavior-templates", json={
+            "name": "Broken Template",
+            "role_id": 1,
+            "os_type": "linux",
+            "template_data": {
+                "work_schedule": {"breaks": "13:00"},
+                "applications_used": "Slack"
+            }
+        })
+        assert response.status_code == 422
@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import FileResponse
+from fastapi.responses import Response
 from sqlalchemy.orm import Session
 from sqlalchemy import desc
 from typing import List, Optional
@@ -7,13 +7,15 @@ from pydantic import BaseModel
 from typing import Dict, Any
 import uuid
 import os
-import json
-import tempfile
 from datetime import datetime
 
+import orjson
+
+from app.database import no_expire_on_commit
 from app.deps import get_db
 from app.models.models import Role, BehaviorTemplate, Agent, AgentActivity
-from app.schemas import AgentConfig, AgentResponse, AgentGenerateResponse, DeploymentRequest
+from app.responses import ORJSONResponse, typed_json_response
+from app.schemas import AgentConfig, AgentResponse, AgentResponseList, AgentGenerateResponse, DeploymentRequest
 
 SHARED_CONFIG_DIR = "/tmp/shared_configs"
 
@@ -60,8 +62,9 @@ def generate_agent(config: AgentConfig, db: Session = Depends(get_db)):
     )
 
     db.add(db_agent)
-    db.commit()
-    db.refresh(db_agent)
+    # role/template are read below; keep them loaded instead of re-SELECTing
+    with no_expire_on_commit(db):
+        db.commit()
 
     # Generate agent configuration
     agent_config = {
@@ -88,20 +91,22 @@ def generate_agent(config: AgentConfig, db: Session = Depends(get_db)):
         task_filepath = os.path.join("/tmp", task_filename) # Правильный путь к общему тому
 
     # Save the full agent configuration to this file
-        with open(task_filepath, 'w') as f:
-            json.dump(agent_config, f, indent=4)
+        with open(task_filepath, 'wb') as f:
+            f.write(orjson.dumps(agent_config))
 
     except Exception as e:
         print(f"WARNING: Failed to create deployment task file: {e}")
 # --- END OF THE AUTOMATION BLOCK ---
 
-    return AgentGenerateResponse(
+    # Already validated here; returning the response directly skips the
+    # second response_model pass (response_model stays for the docs)
+    return ORJSONResponse(AgentGenerateResponse(
         agent_id=agent_id,
         message=f"Agent '{config.name}' configured successfully",
         config=agent_config,
         download_url=f"/api/agents/{agent_id}/config/download",
         status_url=f"/api/agents/{agent_id}/status"
-    )
+    ))
 
 @router.post("/agents/{agent_id}/deploy", status_code=202)
 def trigger_deployment(
@@ -132,16 +137,15 @@ def trigger_deployment(
     }
 
     # Ensure the shared directory exists
-    if not os.path.exists(SHARED_CONFIG_DIR):
-        os.makedirs(SHARED_CONFIG_DIR)
+    os.makedirs(SHARED_CONFIG_DIR, exist_ok=True)
 
     # Create a unique filename for the task
     task_filename = f"deploy_task_{uuid.uuid4()}.json"
     task_filepath = os.path.join(SHARED_CONFIG_DIR, task_filename)
 
     try:
-        with open(task_filepath, 'w') as f:
-            json.dump(deployment_task, f, indent=4)
+        with open(task_filepath, 'wb') as f:
+            f.write(orjson.dumps(deployment_task))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to create deployment task file: {e}")
         
@@ -183,17 +187,13 @@ def download_agent_config(agent_id: str, db: Session = Depends(get_db)):
         "version": "1.0"
     }
     
-    # Create temporary file
-    content = json.dumps(config, indent=2)
+    # Users open this file by hand, so keep it indented
+    content = orjson.dumps(config, option=orjson.OPT_INDENT_2)
     filename = f"{agent_id}_config.json"
     
-    with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.json') as tmp:
-        tmp.write(content)
-        tmp_path = tmp.name
-    
-    return FileResponse(
-        path=tmp_path,
-        filename=filename,
+    # Send the encoded bytes directly - no temp file round trip through disk
+    return Response(
+        content,
         media_type="application/json",
         headers={"Content-Disposition": f"attachment; filename={filename}"}
     )
@@ -218,7 +218,7 @@ def list_agents(
         query = query.filter(Agent.role_id == role_id)
     
     agents = query.order_by(desc(Agent.created_at)).offset(skip).limit(limit).all()
-    return agents
+    return typed_json_response(AgentResponseList, agents)
 
 @router.get("/agents/{agent_id}/status")
 def get_agent_status(agent_id: str, db: Session = Depends(get_db)):
@@ -232,7 +232,7 @@ def get_agent_status(agent_id: str, db: Session = Depends(get_db)):
         AgentActivity.agent_id == agent.id
     ).order_by(desc(AgentActivity.timestamp)).limit(10).all()
     
-    return {
+    return ORJSONResponse({
         "agent": {
             "agent_id": agent.agent_id,
             "name": agent.name,
@@ -252,37 +252,4 @@ def get_agent_status(agent_id: str, db: Session = Depends(get_db)):
                 "timestamp": activity.timestamp
             } for activity in recent_activities
         ]
-    }
-
-# SIMPLE DEPLOYMENT (Future enhancement)
-@router.post("/agents/{agent_id}/deploy")
-def deploy_agent_simple(agent_id: str, deployment_info: dict, db: Session = Depends(get_db)):
-    """Simple agent deployment (placeholder for future)"""
-    agent = db.query(Agent).filter(Agent.agent_id == agent_id).first()
-    if not agent:
-        raise HTTPException(status_code=404, detail="Agent not found")
-    
-    # Update agent status
-    agent.status = "deploying"
-    agent.injection_target = deployment_info.get("target_host", "localhost")
-    db.commit()
-    
-    # Log deployment attempt
-    activity = AgentActivity(
-        agent_id=agent.id,
-        activity_type="deployment_initiated",
-        activity_data={
-            "target_host": deployment_info.get("target_host", "localhost"),
-            "deployment_method": deployment_info.get("method", "manual"),
-            "timestamp": datetime.utcnow().isoformat()
-        }
-    )
-    db.add(activity)
-    db.commit()
-    
-    return {
-        "status": "deployment_initiated",
-        "agent_id": agent_id,
-        "target_host": deployment_info.get("target_host", "localhost"),
-        "message": "Deployment process started. Use config download URL to get agent configuration."
-    }
+    })
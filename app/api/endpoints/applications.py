@@ -4,7 +4,8 @@ from typing import List, Optional
 
 from app.deps import get_db
 from app.models.models import ApplicationTemplate
-from app.schemas import ApplicationTemplateCreate, ApplicationTemplateResponse, ApplicationTemplateUpdate
+from app.responses import typed_json_response
+from app.schemas import ApplicationTemplateCreate, ApplicationTemplateResponse, ApplicationTemplateResponseList, ApplicationTemplateUpdate
 
 router = APIRouter()
 
@@ -51,7 +52,7 @@ def list_application_templates(
         query = query.filter(ApplicationTemplate.os_type == os_type)
     
     templates = query.offset(skip).limit(limit).all()
-    return templates
+    return typed_json_response(ApplicationTemplateResponseList, templates)
 
 @router.get("/application-templates/{template_id}", response_model=ApplicationTemplateResponse)
 def get_application_template(template_id: int, db: Session = Depends(get_db)):
@@ -4,8 +4,10 @@ from typing import List, Optional
 from datetime import datetime
 
 from app.deps import get_db
+from app.enums import BuildStatus
 from app.models.models import Agent, AgentBuild
-from app.schemas import AgentBuildRequest, AgentBuildResponse
+from app.responses import typed_json_response
+from app.schemas import AgentBuildRequest, AgentBuildResponse, AgentBuildResponseList
 
 router = APIRouter()
 
@@ -22,7 +24,7 @@ def trigger_agent_build(
     # Check if there's already a build in progress
     existing_build = db.query(AgentBuild).filter(
         AgentBuild.agent_id == agent.id,
-        AgentBuild.build_status.in_(["pending", "building"])
+        AgentBuild.build_status.in_([BuildStatus.PENDING, BuildStatus.BUILDING])
     ).first()
     
     if existing_build and not request.force_rebuild:
@@ -41,7 +43,7 @@ def trigger_agent_build(
     db_build = AgentBuild(
         agent_id=agent.id,
         build_config=build_config,
-        build_status="ready",  # MVP: immediately mark as ready
+        build_status=BuildStatus.READY,  # MVP: immediately mark as ready
         binary_path=f"/builds/{agent.agent_id}_{agent.os_type}",
         binary_size=1024000,  # Mock 1MB binary
         build_log="MVP Build: Agent configuration prepared successfully.",
@@ -60,7 +62,7 @@ def trigger_agent_build(
 
 @router.get("/builds", response_model=List[AgentBuildResponse])
 def list_builds(
-    status: Optional[str] = None,
+    status: Optional[BuildStatus] = None,
     agent_id: Optional[str] = None,
     skip: int = 0,
     limit: int = 100,
@@ -78,7 +80,7 @@ def list_builds(
             query = query.filter(AgentBuild.agent_id == agent.id)
     
     builds = query.order_by(AgentBuild.created_at.desc()).offset(skip).limit(limit).all()
-    return builds
+    return typed_json_response(AgentBuildResponseList, builds)
 
 @router.get("/builds/{build_id}", response_model=AgentBuildResponse)
 def get_build_status(build_id: int, db: Session = Depends(get_db)):
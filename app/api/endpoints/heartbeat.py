@@ -1,14 +1,23 @@
 # app/api/endpoints/heartbeat.py
-from fastapi import APIRouter, Depends, HTTPException, Header
+from fastapi import APIRouter, Depends, HTTPException, Header, Request
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
-from typing import Optional, Dict, List
+from sqlalchemy import desc, func
+from typing import Any, Callable, Optional, Dict, List, Tuple
 from datetime import datetime, timedelta
 import logging
+import threading
+import time
 
+import msgspec
+
+from app.database import no_expire_on_commit
 from app.deps import get_db
+from app.fast_schemas import (
+    AgentHeartbeatStruct, convert_heartbeat, heartbeat_decoder, heartbeat_msgpack_decoder
+)
 from app.models.models import Agent, AgentActivity
-from app.schemas import AgentHeartbeatRequest, AgentHeartbeatResponse
+from app.responses import ORJSONResponse
+from app.schemas import AgentHeartbeatResponse
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -25,9 +34,86 @@ def verify_api_key(authorization: Optional[str] = Header(None)):
         raise HTTPException(status_code=401, detail="Invalid API key")
     return True
 
-@router.post("/agents/heartbeat", response_model=AgentHeartbeatResponse)
+# Ограничение частоты heartbeat'ов на агента (token bucket)
+HEARTBEAT_RATE_LIMIT = 100.0  # токенов в секунду
+HEARTBEAT_BURST = 100.0       # ёмкость корзины
+
+HEARTBEAT_MAX_BUCKETS = 10000 # верхняя граница числа корзин в памяти
+
+# После такого простоя корзина гарантированно снова полная - хранить её незачем
+_BUCKET_IDLE_SECONDS = HEARTBEAT_BURST / HEARTBEAT_RATE_LIMIT
+
+# agent_id -> (оставшиеся токены, время последнего пополнения).
+# Порядок ключей - порядок последнего обращения (старые в начале)
+_rate_buckets: Dict[str, Tuple[float, float]] = {}
+_rate_lock = threading.Lock()
+
+def _evict_rate_buckets(now: float) -> None:
+    """Удаляет простаивающие корзины и держит их число не больше HEARTBEAT_MAX_BUCKETS (под _rate_lock)"""
+    while _rate_buckets:
+        oldest = next(iter(_rate_buckets))
+        _, last_refill = _rate_buckets[oldest]
+        if now - last_refill < _BUCKET_IDLE_SECONDS and len(_rate_buckets) < HEARTBEAT_MAX_BUCKETS:
+            break
+        del _rate_buckets[oldest]
+
+def consume_heartbeat_token(agent_id: str) -> bool:
+    """Списывает токен из корзины агента. False - лимит превышен"""
+    now = time.monotonic()
+    with _rate_lock:
+        tokens, last_refill = _rate_buckets.pop(agent_id, (HEARTBEAT_BURST, now))
+        _evict_rate_buckets(now)
+        tokens = min(HEARTBEAT_BURST, tokens + (now - last_refill) * HEARTBEAT_RATE_LIMIT)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        # Вставляем заново, чтобы корзина переехала в конец порядка обращений
+        _rate_buckets[agent_id] = (tokens, now)
+        return allowed
+
+# Тело heartbeat'а как пришло + проверенная структура с нужными полями
+ParsedHeartbeat = Tuple[AgentHeartbeatStruct, Dict[str, Any]]
+
+def _decode_heartbeat(decode: Callable[[bytes], Any], raw: bytes) -> ParsedHeartbeat:
+    try:
+        body = decode(raw)
+        return convert_heartbeat(body), body
+    except (msgspec.DecodeError, TypeError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid heartbeat: {e}")
+
+def _decode_msgpack_body(raw: bytes) -> Any:
+    # В MessagePack есть bin/ext/timestamp, которых нет в JSON: приводим тело к
+    # JSON-совместимому виду (bytes -> base64, ключи -> строки), ext отклоняем
+    return msgspec.to_builtins(heartbeat_msgpack_decoder.decode(raw), str_keys=True)
+
+async def parse_heartbeat(request: Request) -> ParsedHeartbeat:
+    """Декодирует JSON-тело heartbeat'а через msgspec (без Pydantic)"""
+    return _decode_heartbeat(heartbeat_decoder.decode, await request.body())
+
+async def parse_heartbeat_msgpack(request: Request) -> ParsedHeartbeat:
+    """То же самое для тела в формате MessagePack"""
+    return _decode_heartbeat(_decode_msgpack_body, await request.body())
+
+# Схема тела строится из той же msgspec-структуры, по которой проверяется heartbeat,
+# чтобы документация не расходилась с тем, что реально принимает сервер
+_, _heartbeat_schemas = msgspec.json.schema_components([AgentHeartbeatStruct])
+HEARTBEAT_BODY_SCHEMA = _heartbeat_schemas["AgentHeartbeatStruct"]
+
+def _heartbeat_openapi(media_type: str) -> dict:
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {media_type: {"schema": HEARTBEAT_BODY_SCHEMA}}
+        }
+    }
+
+@router.post(
+    "/agents/heartbeat",
+    response_model=AgentHeartbeatResponse,
+    openapi_extra=_heartbeat_openapi("application/json")
+)
 def receive_agent_heartbeat(
-    heartbeat_data: Dict,
+    heartbeat: ParsedHeartbeat = Depends(parse_heartbeat),
     db: Session = Depends(get_db),
     api_key_valid: Optional[bool] = Depends(verify_api_key)
 ):
@@ -44,14 +130,39 @@ def receive_agent_heartbeat(
     - current_activity: текущая активность
     - status: статус агента (active/stopping)
     """
+    return process_heartbeat(*heartbeat, db)
+
+@router.post(
+    "/agents/heartbeat/msgpack",
+    response_model=AgentHeartbeatResponse,
+    openapi_extra=_heartbeat_openapi("application/msgpack")
+)
+def receive_agent_heartbeat_msgpack(
+    heartbeat: ParsedHeartbeat = Depends(parse_heartbeat_msgpack),
+    db: Session = Depends(get_db),
+    api_key_valid: Optional[bool] = Depends(verify_api_key)
+):
+    """
+    Получает heartbeat от агента в формате MessagePack (Content-Type: application/msgpack)
     
-    logger.info(f"Received heartbeat from agent: {heartbeat_data.get('agent_id')}")
+    Поля те же, что и у JSON-эндпоинта; JSON-вариант остаётся для отладки через curl.
+    """
+    return process_heartbeat(*heartbeat, db)
+
+def process_heartbeat(heartbeat: AgentHeartbeatStruct, body: Dict[str, Any], db: Session) -> dict:
+    """Обновляет агента и сохраняет heartbeat; общая часть JSON и MessagePack эндпоинтов"""
+    agent_id = heartbeat.agent_id
+    logger.info(f"Received heartbeat from agent: {agent_id}")
+    
+    # Одна метка времени на весь запрос
+    now = datetime.utcnow()
     
-    # Извлекаем данные из heartbeat
-    agent_id = heartbeat_data.get('agent_id')
     if not agent_id:
         raise HTTPException(status_code=400, detail="agent_id is required")
     
+    if not consume_heartbeat_token(agent_id):
+        raise HTTPException(status_code=429, detail="Too many heartbeats from this agent")
+    
     # Проверяем, существует ли агент в БД
     agent = db.query(Agent).filter(Agent.agent_id == agent_id).first()
     
@@ -60,57 +171,55 @@ def receive_agent_heartbeat(
         logger.info(f"Creating new agent: {agent_id}")
         agent = Agent(
             agent_id=agent_id,
-            name=heartbeat_data.get('username', 'Unknown'),
+            name=heartbeat.username or "Unknown",
             status="active",
-            os_type=heartbeat_data.get('system_info', {}).get('platform', 'unknown'),
+            os_type=(heartbeat.system_info or {}).get('platform', 'unknown'),
             config={
-                'role': heartbeat_data.get('role'),
-                'department': heartbeat_data.get('department'),
-                'location': heartbeat_data.get('location')
+                'role': heartbeat.role,
+                'department': heartbeat.department,
+                'location': heartbeat.location
             }
         )
         db.add(agent)
-        db.commit()
-        db.refresh(agent)
+        # flush достаточно, чтобы получить agent.id; коммит - один на весь heartbeat
+        db.flush()
     
     # Обновляем статус агента
-    agent.status = heartbeat_data.get('status', 'active')
-    agent.last_seen = datetime.utcnow()
+    agent.status = heartbeat.status or "active"
+    agent.last_seen = now
     
     # Если есть информация о текущей активности, сохраняем её
-    current_activity = heartbeat_data.get('current_activity')
-    if current_activity:
-        agent.last_activity = current_activity.get('application', 'Unknown')
-    
-    db.commit()
+    if heartbeat.current_activity:
+        agent.last_activity = heartbeat.current_activity.get('application', 'Unknown')
     
     # Сохраняем heartbeat как активность
     activity = AgentActivity(
         agent_id=agent.id,
         activity_type="heartbeat",
-        activity_data=heartbeat_data,
-        timestamp=datetime.utcnow()
+        activity_data=body,  # сохраняем heartbeat в том виде, в каком его прислал агент
+        timestamp=now
     )
     db.add(activity)
     
     # Если есть статистика, сохраняем её отдельно
-    statistics = heartbeat_data.get('statistics')
-    if statistics:
+    if heartbeat.statistics:
         stats_activity = AgentActivity(
             agent_id=agent.id,
             activity_type="statistics",
-            activity_data=statistics,
-            timestamp=datetime.utcnow()
+            activity_data=heartbeat.statistics,
+            timestamp=now
         )
         db.add(stats_activity)
     
-    db.commit()
+    # agent.status нужен ниже для ответа - не перечитываем агента после коммита
+    with no_expire_on_commit(db):
+        db.commit()
     
     # Формируем ответ
     response = {
         "status": "received",
         "agent_id": agent_id,
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": now,
         "message": "Heartbeat processed successfully",
         "next_heartbeat_in": 86400  # 24 часа в секундах
     }
@@ -124,33 +233,52 @@ def receive_agent_heartbeat(
 @router.get("/agents/{agent_id}/heartbeats")
 def get_agent_heartbeats(
     agent_id: str,
+    since_id: int = 0,
     limit: int = 10,
     db: Session = Depends(get_db)
 ):
-    """Получает историю heartbeat'ов агента"""
+    """
+    Получает историю heartbeat'ов агента
+    
+    since_id - курсор: возвращаются только heartbeat'ы с id > since_id.
+    Клиент передаёт next_since_id из предыдущего ответа и получает только новые записи.
+    Без since_id возвращаются последние limit записей (новые первыми);
+    с since_id - следующие limit записей по возрастанию id, чтобы при большом
+    потоке heartbeat'ов между опросами ни одна запись не пропала.
+    """
     
     agent = db.query(Agent).filter(Agent.agent_id == agent_id).first()
     if not agent:
         raise HTTPException(status_code=404, detail="Agent not found")
     
     # Получаем heartbeat активности
-    heartbeats = db.query(AgentActivity).filter(
+    query = db.query(AgentActivity).filter(
         AgentActivity.agent_id == agent.id,
-        AgentActivity.activity_type == "heartbeat"
-    ).order_by(desc(AgentActivity.timestamp)).limit(limit).all()
+        AgentActivity.activity_type == "heartbeat",
+        AgentActivity.id > since_id
+    )
     
-    return {
+    if since_id > 0:
+        heartbeats = query.order_by(AgentActivity.id).limit(limit).all()
+        next_since_id = heartbeats[-1].id if heartbeats else since_id
+    else:
+        heartbeats = query.order_by(desc(AgentActivity.id)).limit(limit).all()
+        next_since_id = heartbeats[0].id if heartbeats else since_id
+    
+    return ORJSONResponse({
         "agent_id": agent_id,
         "agent_name": agent.name,
-        "last_seen": agent.last_seen.isoformat() if agent.last_seen else None,
+        "last_seen": agent.last_seen,
         "status": agent.status,
+        "next_since_id": next_since_id,
         "heartbeats": [
             {
-                "timestamp": hb.timestamp.isoformat(),
+                "id": hb.id,
+                "timestamp": hb.timestamp,
                 "data": hb.activity_data
             } for hb in heartbeats
         ]
-    }
+    })
 
 @router.get("/agents/active")
 def get_active_agents(
@@ -166,45 +294,41 @@ def get_active_agents(
         Agent.status == "active"
     ).all()
     
-    return {
+    return ORJSONResponse({
         "threshold_minutes": threshold_minutes,
         "active_count": len(active_agents),
         "agents": [
             {
                 "agent_id": agent.agent_id,
                 "name": agent.name,
-                "last_seen": agent.last_seen.isoformat() if agent.last_seen else None,
+                "last_seen": agent.last_seen,
                 "last_activity": agent.last_activity,
                 "role": agent.config.get('role') if agent.config else None
             } for agent in active_agents
         ]
-    }
+    })
 
 @router.get("/agents/statistics/summary")
 def get_agents_statistics_summary(db: Session = Depends(get_db)):
     """Получает сводную статистику по всем агентам"""
     
-    # Общее количество агентов
-    total_agents = db.query(Agent).count()
-    
-    # Активные агенты (heartbeat за последние 30 минут)
+    # Общее, активные (heartbeat за последние 30 минут) и неактивные агенты - одним проходом
     threshold_time = datetime.utcnow() - timedelta(minutes=30)
-    active_agents = db.query(Agent).filter(
-        Agent.last_seen >= threshold_time,
-        Agent.status == "active"
-    ).count()
-    
-    # Неактивные агенты
-    inactive_agents = db.query(Agent).filter(
-        Agent.status != "active"
-    ).count()
+    total_agents, active_agents, inactive_agents = db.query(
+        func.count(Agent.id),
+        func.count(Agent.id).filter(
+            Agent.last_seen >= threshold_time,
+            Agent.status == "active"
+        ),
+        func.count(Agent.id).filter(Agent.status != "active")
+    ).one()
     
     # Последние heartbeat'ы
     recent_heartbeats = db.query(AgentActivity).filter(
         AgentActivity.activity_type == "heartbeat"
     ).order_by(desc(AgentActivity.timestamp)).limit(5).all()
     
-    return {
+    return ORJSONResponse({
         "summary": {
             "total_agents": total_agents,
             "active_agents": active_agents,
@@ -214,8 +338,8 @@ def get_agents_statistics_summary(db: Session = Depends(get_db)):
         "recent_heartbeats": [
             {
                 "agent_id": hb.agent.agent_id if hb.agent else "unknown",
-                "timestamp": hb.timestamp.isoformat(),
+                "timestamp": hb.timestamp,
                 "status": hb.activity_data.get('status', 'unknown')
             } for hb in recent_heartbeats if hb.agent
         ]
-    }
+    })
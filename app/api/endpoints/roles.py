@@ -5,7 +5,8 @@ from typing import List, Optional
 
 from app.deps import get_db
 from app.models.models import Role
-from app.schemas import RoleCreate, RoleResponse, RoleUpdate
+from app.responses import typed_json_response
+from app.schemas import RoleCreate, RoleResponse, RoleResponseList, RoleUpdate
 
 router = APIRouter()
 
@@ -41,7 +42,7 @@ def list_roles(
         query = query.filter(Role.category == category)
     
     roles = query.offset(skip).limit(limit).all()
-    return roles
+    return typed_json_response(RoleResponseList, roles)
 
 @router.get("/roles/{role_id}", response_model=RoleResponse)
 def get_role(role_id: int, db: Session = Depends(get_db)):
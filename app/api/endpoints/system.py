@@ -1,14 +1,22 @@
 # app/api/endpoints/system.py - System endpoints
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 from datetime import datetime
+import threading
+import time
 
 from app.deps import get_db
 from app.models.models import Role, BehaviorTemplate, Agent, AgentBuild
+from app.responses import dumps
 
 router = APIRouter()
 
+# /stats is polled by every open dashboard tab; serve one result per second
+STATS_CACHE_TTL = 1.0
+_stats_cache = {"t": 0.0, "v": None}
+_stats_lock = threading.Lock()
+
 @router.get("/health")
 def health_check(db: Session = Depends(get_db)):
     """System health check"""
@@ -31,7 +39,22 @@ def health_check(db: Session = Depends(get_db)):
 
 @router.get("/stats")
 def get_system_stats(db: Session = Depends(get_db)):
-    """Get system statistics"""
+    """Get system statistics (cached for STATS_CACHE_TTL seconds)"""
+    # Concurrent pollers wait on the lock and reuse the fresh result.
+    # The encoded body is cached, so hits skip serialization entirely.
+    with _stats_lock:
+        if time.monotonic() - _stats_cache["t"] >= STATS_CACHE_TTL:
+            _stats_cache["v"] = dumps(_collect_system_stats(db))
+            _stats_cache["t"] = time.monotonic()
+        body = _stats_cache["v"]
+    
+    return Response(
+        body,
+        media_type="application/json",
+        headers={"Cache-Control": f"max-age={int(STATS_CACHE_TTL)}"}
+    )
+
+def _collect_system_stats(db: Session) -> dict:
     stats = {
         "roles": {
             "total": db.query(Role).filter(Role.is_active == True).count(),
@@ -87,7 +110,7 @@ def get_system_stats(db: Session = Depends(get_db)):
     return stats
 
 @router.get("/demo/workflow")
-def demo_workflow():
+async def demo_workflow():
     """Demo workflow for MVP V0"""
     return {
         "title": "LISA System Workflow (Backend/CI-CD Perspective)",
@@ -4,7 +4,8 @@ from typing import List, Optional
 
 from app.deps import get_db
 from app.models.models import BehaviorTemplate, Role
-from app.schemas import BehaviorTemplateCreate, BehaviorTemplateResponse, BehaviorTemplateUpdate
+from app.responses import typed_json_response
+from app.schemas import BehaviorTemplateCreate, BehaviorTemplateResponse, BehaviorTemplateResponseList, BehaviorTemplateUpdate
 
 router = APIRouter()
 
@@ -90,7 +91,7 @@ def list_behavior_templates(
         query = query.filter(BehaviorTemplate.os_type == os_type)
     
     templates = query.offset(skip).limit(limit).all()
-    return templates
+    return typed_json_response(BehaviorTemplateResponseList, templates)
 
 @router.get("/behavior-templates/{template_id}", 
            response_model=BehaviorTemplateResponse,
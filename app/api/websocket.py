@@ -1,14 +1,16 @@
 # app/api/websocket.py
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends
-from sqlalchemy.orm import Session
-from app.deps import get_db
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 from typing import Dict, Set
-import json
 import asyncio
 
+from app.responses import dumps
+
 # Create router instance - THIS WAS MISSING!
 router = APIRouter()
 
+# Keep-alive message never changes, encode it once
+PING_MESSAGE = dumps({"type": "ping"}).decode()
+
 class ConnectionManager:
     def __init__(self):
         self.active_connections: Dict[str, Set[WebSocket]] = {}
@@ -27,9 +29,16 @@ class ConnectionManager:
     
     async def send_agent_update(self, agent_id: str, data: dict):
         if agent_id in self.active_connections:
+            # Serialize once and fan the same text frame out to every connection.
+            # Same encoder as the HTTP responses; like a failing send_json,
+            # an unencodable payload is dropped rather than raised
+            try:
+                message = dumps(data).decode()
+            except TypeError:
+                return
             for connection in self.active_connections[agent_id]:
                 try:
-                    await connection.send_json(data)
+                    await connection.send_text(message)
                 except:
                     pass
 
@@ -45,6 +54,6 @@ async def websocket_endpoint(
         while True:
             # Keep connection alive
             await asyncio.sleep(30)
-            await websocket.send_json({"type": "ping"})
+            await websocket.send_text(PING_MESSAGE)
     except WebSocketDisconnect:
         manager.disconnect(websocket, agent_id)
@@ -0,0 +1,22 @@
+# app/enums.py - Enums shared by the ORM models and the API schemas
+#
+# Kept free of SQLAlchemy and Pydantic imports so app.models.models and
+# app.schemas can both depend on it without depending on each other.
+from enum import Enum
+
+
+class OSType(str, Enum):
+    WINDOWS = "windows"
+    LINUX = "linux"
+
+class BuildStatus(str, Enum):
+    PENDING = "pending"
+    BUILDING = "building"
+    READY = "ready"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+class UpdateStatus(str, Enum):
+    STARTED = "started"
+    COMPLETED = "completed"
+    FAILED = "failed"
@@ -0,0 +1,38 @@
+# app/fast_schemas.py - msgspec structs for high-volume agent ingest
+#
+# Agents post heartbeats continuously, so their bodies are decoded with msgspec
+# instead of going through FastAPI's Pydantic body handling. Heartbeats are
+# accepted as JSON or as MessagePack (smaller and cheaper to decode for
+# machine-to-machine traffic). The body is decoded untyped once - it is stored
+# as sent - and then converted (non-strict, like the original Dict handling)
+# into AgentHeartbeatStruct to check and read the fields the server uses.
+# The agent's own timestamp is not one of them (the server stamps rows with
+# its own clock), so it is left out and accepted in any format.
+# The Pydantic models in app/schemas.py remain the source for the admin-side
+# CRUD endpoints.
+from typing import Any, Dict, Optional
+
+import msgspec
+
+
+class AgentHeartbeatStruct(msgspec.Struct, frozen=True, gc=False):
+    # Holds only decoded JSON values, so it can never be part of a reference
+    # cycle; gc=False keeps the per-request structs out of the GC's tracking
+    agent_id: str
+    username: Optional[str] = "Unknown"
+    role: Optional[str] = None
+    department: Optional[str] = None
+    location: Optional[str] = None
+    system_info: Optional[Dict[str, Any]] = None
+    statistics: Optional[Dict[str, Any]] = None
+    current_activity: Optional[Dict[str, Any]] = None
+    status: Optional[str] = "active"
+
+
+heartbeat_decoder = msgspec.json.Decoder()
+heartbeat_msgpack_decoder = msgspec.msgpack.Decoder()
+
+
+def convert_heartbeat(body: Any) -> AgentHeartbeatStruct:
+    """Validate a decoded heartbeat body; unknown keys are ignored, not dropped from the body."""
+    return msgspec.convert(body, AgentHeartbeatStruct, strict=False)
@@ -1,8 +1,6 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from datetime import datetime
-from typing import Dict, List, Optional
-import uuid
+from app.responses import ORJSONResponse
 
 # Database imports
 from app.database import Base, engine
@@ -17,7 +15,8 @@ app = FastAPI(
     description="Legitimate Infrastructure Simulation Agent - Management API",
     version="0.1.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -32,7 +31,7 @@ app.add_middleware(
 # DASHBOARD DATA 
 
 @app.get("/api/dashboard/stats")
-def get_dashboard_stats():
+async def get_dashboard_stats():
     """Get dashboard statistics"""
     # In production, this should query the database
     return {
@@ -56,7 +55,7 @@ app.include_router(applications.router, prefix="/api", tags=["Applications"])
 app.include_router(servers.router, prefix='/api', tags=["Servers"])
 
 @app.get("/")
-def root():
+async def root():
     return {
         "service": "LISA Backend API",
         "version": "0.1.0",
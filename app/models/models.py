@@ -1,6 +1,12 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, TIMESTAMP, JSON, Boolean, func
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, TIMESTAMP, JSON, Boolean, Enum, func
 from sqlalchemy.orm import relationship
 from app.database import Base
+from app.enums import BuildStatus, UpdateStatus
+
+
+def _enum_values(enum_cls):
+    # Store the lowercase values ("pending"), not the member names ("PENDING")
+    return [member.value for member in enum_cls]
 
 class Role(Base):
     __tablename__ = 'roles'
@@ -88,7 +94,7 @@ class AgentBuild(Base):
     id = Column(Integer, primary_key=True, index=True)
     agent_id = Column(Integer, ForeignKey('agents.id', ondelete='CASCADE'), nullable=False)
     build_config = Column(JSON, nullable=False)
-    build_status = Column(String(50), nullable=False, default='pending')  # pending, building, completed, failed
+    build_status = Column(Enum(BuildStatus, name='build_status', values_callable=_enum_values), nullable=False, default=BuildStatus.PENDING)
     binary_path = Column(Text)
     binary_size = Column(Integer)
     build_log = Column(Text)
@@ -109,7 +115,7 @@ class AgentUpdateLog(Base):
     user_id = Column(Text, nullable=False)
     old_version = Column(Text)
     new_version = Column(Text)
-    update_status = Column(String(50), nullable=False)  # 'started', 'completed', 'failed'
+    update_status = Column(Enum(UpdateStatus, name='update_status', values_callable=_enum_values), nullable=False)
     update_log = Column(Text)
     created_at = Column(TIMESTAMP, server_default=func.now())
 
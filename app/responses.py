@@ -0,0 +1,75 @@
+# app/responses.py - Response classes
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Iterable
+from uuid import UUID
+
+import orjson
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel, TypeAdapter
+
+
+def _default(obj: Any) -> Any:
+    # Called by orjson for each value it can't encode natively, wherever it
+    # appears (top level, list items, nested dict values)
+    if isinstance(obj, BaseModel):
+        # python mode, so the datetime conversion is done once, by orjson
+        return obj.model_dump()
+    if isinstance(obj, Decimal):
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _stdlib_default(obj: Any) -> Any:
+    # The types orjson encodes natively, for the json.dumps fallback below
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, UUID):
+        return str(obj)
+    return _default(obj)
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Encode content to JSON bytes with orjson.
+
+    datetime, enum and UUID values (also as dict keys) are handled natively,
+    Pydantic models are dumped, Decimal becomes a string; any other type
+    raises TypeError instead of being silently stringified. Integers outside
+    the 64-bit range (which orjson rejects) go through the stdlib encoder.
+    """
+    try:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    except TypeError:
+        return json.dumps(
+            content, default=_stdlib_default, ensure_ascii=False, separators=(",", ":")
+        ).encode()
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSON response rendered with orjson.
+
+    Handlers returning plain dicts or Pydantic models can return this
+    directly to skip FastAPI's jsonable_encoder pass; see dumps() for the
+    supported types.
+    """
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def typed_json_response(adapter: TypeAdapter, rows: Iterable[Any]) -> Response:
+    """
+    Serialize ORM rows through a prebuilt list TypeAdapter.
+
+    Bypasses FastAPI's response_model pipeline (keep response_model on the
+    route for the OpenAPI docs).
+    """
+    items = adapter.validate_python(rows, from_attributes=True)
+    return Response(adapter.dump_json(items), media_type="application/json")
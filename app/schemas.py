@@ -1,23 +1,10 @@
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, TypeAdapter, field_validator
 from typing import Optional, Dict, List, Any
 from datetime import datetime
-from enum import Enum
 
-# Enums
-class OSType(str, Enum):
-    WINDOWS = "windows"
-    LINUX = "linux"
+from app.enums import UpdateStatus
+from app.validators import check_custom_config, check_template_config, check_template_data
 
-class BuildStatus(str, Enum):
-    PENDING = "pending"
-    BUILDING = "building"
-    COMPLETED = "completed"
-    FAILED = "failed"
-
-class UpdateStatus(str, Enum):
-    STARTED = "started"
-    COMPLETED = "completed"
-    FAILED = "failed"
 
 class DeploymentRequest(BaseModel):
     server_ip: str
@@ -26,9 +13,9 @@ class DeploymentRequest(BaseModel):
     
 # Role schemas
 class RoleBase(BaseModel):
-    name: str = Field(..., example="Junior Developer")
-    description: str = Field(..., example="Entry-level software developer")
-    category: str = Field(..., example="Development")
+    name: str
+    description: str
+    category: str
 
 class RoleCreate(RoleBase):
     model_config = ConfigDict(
@@ -42,10 +29,21 @@ class RoleCreate(RoleBase):
     )
 
 class RoleUpdate(BaseModel):
-    name: Optional[str] = Field(None, example="Senior Developer")
-    description: Optional[str] = Field(None, example="Experienced software developer")
-    category: Optional[str] = Field(None, example="Development")
-    is_active: Optional[bool] = Field(None, example=True)
+    name: Optional[str] = None
+    description: Optional[str] = None
+    category: Optional[str] = None
+    is_active: Optional[bool] = None
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "name": "Senior Developer",
+                "description": "Experienced software developer",
+                "category": "Development",
+                "is_active": True
+            }
+        }
+    )
 
 class RoleResponse(RoleBase):
     id: int
@@ -55,52 +53,22 @@ class RoleResponse(RoleBase):
     model_config = ConfigDict(from_attributes=True)
         
 # HEARTBEAT SCHEMAS
-class AgentHeartbeatRequest(BaseModel):
-    timestamp: datetime
-    agent_id: str
-    username: str
-    role: str
-    department: Optional[str] = None
-    location: Optional[str] = None
-    system_info: Dict
-    statistics: Optional[Dict] = None
-    current_activity: Optional[Dict] = None
-    status: str = "active"
-
 class AgentHeartbeatResponse(BaseModel):
     status: str
     agent_id: str
     timestamp: datetime
     message: str
     next_heartbeat_in: int
-    commands: Optional[List[Dict]] = []
+    commands: Optional[List[Dict]] = Field(default_factory=list)
 
 # Behavior Template schemas
 class BehaviorTemplateBase(BaseModel):
-    name: str = Field(..., example="Standard Developer Behavior")
-    description: Optional[str] = Field(None, example="Standard behavior pattern for developers")
-    role_id: int = Field(..., example=1, description="ID of the role this template belongs to")
-    template_data: Dict = Field(..., example={
-        "work_schedule": {
-            "start_time": "09:00",
-            "end_time": "18:00",
-            "breaks": [{"start": "13:00", "duration_minutes": 60}]
-        },
-        "applications_used": [
-            "Visual Studio Code",
-            "Google Chrome", 
-            "Slack",
-            "Docker Desktop"
-        ],
-        "activity_pattern": "Regular office hours with lunch break",
-        "productivity_metrics": {
-            "code_sessions_per_day": "4-6",
-            "average_session_length": "45-90 minutes",
-            "break_frequency": "every 2 hours"
-        }
-    })
-    os_type: str = Field(..., example="linux")
-    version: str = Field(default="1.0", example="1.0")
+    name: str
+    description: Optional[str] = None
+    role_id: int = Field(..., description="ID of the role this template belongs to")
+    template_data: Dict
+    os_type: str
+    version: str = "1.0"
 
 class BehaviorTemplateCreate(BehaviorTemplateBase):
     model_config = ConfigDict(
@@ -134,14 +102,37 @@ class BehaviorTemplateCreate(BehaviorTemplateBase):
         }
     )
 
+    @field_validator("template_data")
+    @classmethod
+    def validate_template_data(cls, v):
+        return check_template_data(v)
+
 class BehaviorTemplateUpdate(BaseModel):
-    name: Optional[str] = Field(None, example="Updated Developer Behavior")
-    description: Optional[str] = Field(None, example="Updated behavior pattern")
-    role_id: Optional[int] = Field(None, example=1)
+    name: Optional[str] = None
+    description: Optional[str] = None
+    role_id: Optional[int] = None
     template_data: Optional[Dict] = None
-    os_type: Optional[str] = Field(None, example="linux")
-    version: Optional[str] = Field(None, example="1.1")
-    is_active: Optional[bool] = Field(None, example=True)
+    os_type: Optional[str] = None
+    version: Optional[str] = None
+    is_active: Optional[bool] = None
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "name": "Updated Developer Behavior",
+                "description": "Updated behavior pattern",
+                "role_id": 1,
+                "os_type": "linux",
+                "version": "1.1",
+                "is_active": True
+            }
+        }
+    )
+
+    @field_validator("template_data")
+    @classmethod
+    def validate_template_data(cls, v):
+        return check_template_data(v)
 
 class BehaviorTemplateResponse(BehaviorTemplateBase):
     id: int
@@ -153,22 +144,14 @@ class BehaviorTemplateResponse(BehaviorTemplateBase):
 
 # Agent schemas 
 class AgentConfig(BaseModel):
-    name: str = Field(..., example="TestAgent01")
-    role_id: int = Field(..., example=1, description="ID of the role for this agent")
-    template_id: int = Field(..., example=1, description="ID of the behavior template")
-    os_type: str = Field(..., example="linux")
-    injection_target: Optional[str] = Field(None, example="dev-workstation-01")
-    custom_config: Optional[Dict] = Field(default={}, example={
-        "department": "Development",
-        "location": "Headquarters",
-        "custom_apps": ["IntelliJ IDEA"]
-    })
+    name: str
+    role_id: int = Field(..., description="ID of the role for this agent")
+    template_id: int = Field(..., description="ID of the behavior template")
+    os_type: str
+    injection_target: Optional[str] = None
+    custom_config: Optional[Dict] = Field(default_factory=dict)
     # Version info for agent updates
-    version_info: Optional[Dict] = Field(default={}, example={
-        "version_hash": "abc123def456",
-        "build_version": "1.0.0",
-        "last_updated": "2025-01-15T10:30:00Z"
-    })
+    version_info: Optional[Dict] = Field(default_factory=dict)
     
     model_config = ConfigDict(
         json_schema_extra={
@@ -190,6 +173,11 @@ class AgentConfig(BaseModel):
         }
     )
 
+    @field_validator("custom_config")
+    @classmethod
+    def validate_custom_config(cls, v):
+        return check_custom_config(v)
+
 class AgentGenerateResponse(BaseModel):
     agent_id: str
     message: str
@@ -224,13 +212,23 @@ class AgentHeartbeat(BaseModel):
 
 # Build schemas
 class AgentBuildRequest(BaseModel):
-    agent_id: str = Field(..., example="USR1234567")
-    force_rebuild: bool = Field(default=False, example=False)
-    compilation_options: Optional[Dict] = Field(default={}, example={
-        "optimization": "release",
-        "include_debug": False,
-        "version_hash": "abc123def456"
-    })
+    agent_id: str
+    force_rebuild: bool = False
+    compilation_options: Optional[Dict] = Field(default_factory=dict)
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "agent_id": "USR1234567",
+                "force_rebuild": False,
+                "compilation_options": {
+                    "optimization": "release",
+                    "include_debug": False,
+                    "version_hash": "abc123def456"
+                }
+            }
+        }
+    )
 
 class AgentBuildResponse(BaseModel):
     id: int
@@ -249,15 +247,29 @@ class AgentBuildResponse(BaseModel):
 
 # Agent Update Log schemas
 class AgentUpdateLogBase(BaseModel):
-    template_id: int = Field(..., example=1)
-    user_id: str = Field(..., example="admin_user")
-    old_version: Optional[str] = Field(None, example="1.0.0")
-    new_version: str = Field(..., example="1.1.0")
-    update_status: UpdateStatus = Field(..., example=UpdateStatus.STARTED)
-    update_log: Optional[str] = Field(None, example="Starting update process...")
+    template_id: int
+    user_id: str
+    old_version: Optional[str] = None
+    new_version: str
+    update_status: UpdateStatus
+    update_log: Optional[str] = None
+
+    # Keep the plain string value; it is stored and returned as-is
+    model_config = ConfigDict(use_enum_values=True)
 
 class AgentUpdateLogCreate(AgentUpdateLogBase):
-    pass
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "template_id": 1,
+                "user_id": "admin_user",
+                "old_version": "1.0.0",
+                "new_version": "1.1.0",
+                "update_status": "started",
+                "update_log": "Starting update process..."
+            }
+        }
+    )
 
 class AgentUpdateLogResponse(AgentUpdateLogBase):
     id: int
@@ -356,21 +368,14 @@ class ErrorResponse(BaseModel):
 
 # ApplicationTemplate schemas
 class ApplicationTemplateBase(BaseModel):
-    name: str = Field(..., example="Visual Studio Code")
-    display_name: Optional[str] = Field(None, example="VS Code")
-    category: Optional[str] = Field(None, example="Development Tools")
-    description: Optional[str] = Field(None, example="Code editor for development")
-    version: str = Field(default="1.0", example="1.0")
-    author: Optional[str] = Field(None, example="Microsoft")
-    template_config: Dict = Field(..., example={
-        "executable_path": "/usr/bin/code",
-        "startup_args": ["--disable-extensions"],
-        "window_behavior": {
-            "minimize_probability": 0.1,
-            "focus_duration_minutes": "15-45"
-        }
-    })
-    os_type: str = Field(default="linux", example="linux")
+    name: str
+    display_name: Optional[str] = None
+    category: Optional[str] = None
+    description: Optional[str] = None
+    version: str = "1.0"
+    author: Optional[str] = None
+    template_config: Dict
+    os_type: str = "linux"
 
 class ApplicationTemplateCreate(ApplicationTemplateBase):
     model_config = ConfigDict(
@@ -395,6 +400,11 @@ class ApplicationTemplateCreate(ApplicationTemplateBase):
         }
     )
 
+    @field_validator("template_config")
+    @classmethod
+    def validate_template_config(cls, v):
+        return check_template_config(v)
+
 class ApplicationTemplateUpdate(BaseModel):
     name: Optional[str] = None
     display_name: Optional[str] = None
@@ -406,6 +416,11 @@ class ApplicationTemplateUpdate(BaseModel):
     os_type: Optional[str] = None
     is_active: Optional[bool] = None
 
+    @field_validator("template_config")
+    @classmethod
+    def validate_template_config(cls, v):
+        return check_template_config(v)
+
 class ApplicationTemplateResponse(ApplicationTemplateBase):
     id: int
     is_active: bool
@@ -422,3 +437,12 @@ class ServerTemplate(BaseModel):
     login: str = None
     password: str = None
     os: str = None
+
+# Typed list serializers, built once at import: pydantic-core compiles a
+# validator/serializer for the exact shape, so a whole page of ORM rows is
+# validated and dumped to JSON in one call each (see app.responses).
+AgentResponseList = TypeAdapter(List[AgentResponse])
+RoleResponseList = TypeAdapter(List[RoleResponse])
+BehaviorTemplateResponseList = TypeAdapter(List[BehaviorTemplateResponse])
+ApplicationTemplateResponseList = TypeAdapter(List[ApplicationTemplateResponse])
+AgentBuildResponseList = TypeAdapter(List[AgentBuildResponse])
@@ -0,0 +1,91 @@
+# app/validators.py - Structural checks for free-form JSON payloads
+#
+# template_data / template_config / custom_config are stored as JSON and only
+# interpreted by the agent runtime. The JSON schemas below are compiled once
+# at import time with fastjsonschema; the generated validators are called
+# from Pydantic field validators on the create/update schemas.
+# Unknown keys are allowed so existing templates keep working.
+from typing import Any, Callable, Dict, Optional
+
+import fastjsonschema
+from fastjsonschema import JsonSchemaException
+
+_STRING_LIST = {"type": "array", "items": {"type": "string"}}
+
+TEMPLATE_DATA_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "work_schedule": {
+            "type": "object",
+            "properties": {
+                "start_time": {"type": "string"},
+                "end_time": {"type": "string"},
+                "breaks": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "start": {"type": "string"},
+                            "duration_minutes": {"type": "integer", "minimum": 0}
+                        }
+                    }
+                }
+            }
+        },
+        "applications_used": _STRING_LIST,
+        "activity_pattern": {"type": "string"},
+        "productivity_metrics": {"type": "object"},
+        "behavior_traits": {"type": "object"}
+    }
+}
+
+TEMPLATE_CONFIG_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "executable_path": {"type": "string"},
+        "startup_args": _STRING_LIST,
+        "window_behavior": {
+            "type": "object",
+            "properties": {
+                "minimize_probability": {"type": "number", "minimum": 0, "maximum": 1},
+                "focus_duration_minutes": {"type": "string"}
+            }
+        }
+    }
+}
+
+CUSTOM_CONFIG_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "department": {"type": "string"},
+        "location": {"type": "string"},
+        "custom_apps": _STRING_LIST
+    }
+}
+
+_validate_template_data = fastjsonschema.compile(TEMPLATE_DATA_SCHEMA)
+_validate_template_config = fastjsonschema.compile(TEMPLATE_CONFIG_SCHEMA)
+_validate_custom_config = fastjsonschema.compile(CUSTOM_CONFIG_SCHEMA)
+
+
+def _check(validator: Callable[[Any], Any], value: Optional[Dict]) -> Optional[Dict]:
+    if value is None:
+        return value
+    try:
+        validator(value)
+    except JsonSchemaException as e:
+        # Pydantic turns ValueError into a regular 422 validation error
+        raise ValueError(e.message)
+    return value
+
+
+def check_template_data(value: Optional[Dict]) -> Optional[Dict]:
+    return _check(_validate_template_data, value)
+
+
+def check_template_config(value: Optional[Dict]) -> Optional[Dict]:
+    return _check(_validate_template_config, value)
+
+
+def check_custom_config(value: Optional[Dict]) -> Optional[Dict]:
+    return _check(_validate_custom_config, value)